@@ -1,25 +1,45 @@
-import paho.mqtt.client as mqtt
 import json
+import logging
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "simulator"))
+from mqtt_pool import get_client, close_all
 
 BROKER = "localhost"
 PORT = 1883
 DEVICE_ID = "PUMP-001" # Phải khớp với deviceId trong Rule
 TOPIC_CONTROL = f"device/{DEVICE_ID}/control"
 
-def on_connect(client, userdata, flags, rc):
+logger = logging.getLogger(__name__)
+
+def on_connect(client):
+    # pool gọi lại sau mỗi lần (re)connect để đăng ký lại topic
     print("Pump connected to MQTT.")
+    client.on_message = on_message
     client.subscribe(TOPIC_CONTROL)
     print(f"Pump is listening on topic: {TOPIC_CONTROL}")
 
 def on_message(client, userdata, msg):
     print(f"\n>>>> PUMP RECEIVED COMMAND <<<<")
     print(f"From topic: {msg.topic}")
-    payload = json.loads(msg.payload.decode())
-    print(f"Payload: {json.dumps(payload, indent=2)}")
+    print(f"Payload: {msg.payload.decode()}")
+    # chỉ parse + in đẹp khi bật DEBUG, bình thường in thẳng chuỗi nhận được
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Payload (pretty):\n%s", json.dumps(json.loads(msg.payload), indent=2))
     print("================================\n")
 
-client = mqtt.Client()
-client.on_connect = on_connect
-client.on_message = on_message
-client.connect(BROKER, PORT, 60)
-client.loop_forever()
\ No newline at end of file
+logging.basicConfig(level=logging.WARNING)  # logging.DEBUG để in payload dạng JSON đẹp
+
+client = get_client(BROKER, PORT, on_connect=on_connect)
+if client is None:
+    print(f"Failed to connect to MQTT Broker at {BROKER}:{PORT}")
+    sys.exit(1)
+
+# network loop của pool chạy trên thread riêng, ở đây chỉ cần giữ tiến trình sống
+try:
+    while True:
+        time.sleep(1)
+except KeyboardInterrupt:
+    close_all()
\ No newline at end of file
@@ -1,8 +1,11 @@
-import paho.mqtt.client as mqtt
 import json
-import time
+import os
+import sys
 from datetime import datetime
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "simulator"))
+from mqtt_pool import get_client, close_all
+
 BROKER = "localhost"
 PORT = 1883
 # DEVICE_ID = "DHT-001" # Phải khớp với deviceId bạn đã tạo ở Luồng 2
@@ -10,11 +13,16 @@ PORT = 1883
 DEVICE_ID = "SOIL-001" # Thay đổi
 TOPIC = f"sensor/{DEVICE_ID}/data"
 
-client = mqtt.Client()
+client = None
 
 def connect_mqtt():
-    client.connect(BROKER, PORT, 60)
-    print(f"Connected to MQTT Broker at {BROKER}:{PORT}")
+    # Lấy client từ pool: gọi lại (chạy nhiều test liên tiếp) dùng lại phiên MQTT đã có
+    global client
+    client = get_client(BROKER, PORT)
+    if client is not None:
+        print(f"Connected to MQTT Broker at {BROKER}:{PORT}")
+    else:
+        print(f"Failed to connect to MQTT Broker at {BROKER}:{PORT}")
 
 def publish_data():
     payload = {
@@ -36,17 +44,18 @@ def publish_data():
     #     "timestamp": datetime.now().isoformat()
     # }
     payload_json = json.dumps(payload)
-    result = client.publish(TOPIC, payload_json)
+    if client is None:
+        print(f"Failed to send message to topic {TOPIC}")
+        return
+    result = client.publish(TOPIC, payload_json, qos=0)  # telemetry: QoS 0, không cần PUBACK
     
     if result[0] == 0:
+        result.wait_for_publish(timeout=2)
         print(f"Sent `{payload_json}` to topic `{TOPIC}`")
     else:
         print(f"Failed to send message to topic {TOPIC}")
 
 if __name__ == '__main__':
     connect_mqtt()
-    client.loop_start()
-    time.sleep(1)
     publish_data()
-    time.sleep(1)
-    client.loop_stop()
\ No newline at end of file
+    close_all()
\ No newline at end of file
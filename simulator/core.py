@@ -0,0 +1,600 @@
+"""
+Shared MQTT sensor simulator for the Smart Farm entry scripts
+(sensor_simulator.py, sensor_simulator1.py)
+"""
+
+import asyncio
+import logging
+import sys
+import time
+import zlib
+import random
+import math
+import signal
+import socket
+from datetime import datetime
+from typing import Dict, Any, List
+import numpy as np
+import orjson
+import paho.mqtt.client as mqtt
+from paho.mqtt.packettypes import PacketTypes
+from paho.mqtt.properties import Properties
+
+FARM_ID = 1
+PAYLOAD_SCHEMAS = ("ph", "soilPH")  # name of the pH field in PH readings
+COMPRESS_THRESHOLD = 256  # batches larger than this (bytes) are zlib-compressed
+RANDOM_BUFFER_SIZE = 1024  # uniform samples drawn from the generator per refill
+ACK_TIMEOUT = 5  # seconds to wait for paho to report a message sent or acknowledged
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncioHelper:
+    """Drive a paho client from an asyncio event loop instead of a loop_start() thread"""
+    def __init__(self, loop, client):
+        self.loop = loop
+        self.client = client
+        self.misc = None
+        self.client.on_socket_open = self.on_socket_open
+        self.client.on_socket_close = self.on_socket_close
+        self.client.on_socket_register_write = self.on_socket_register_write
+        self.client.on_socket_unregister_write = self.on_socket_unregister_write
+        
+    def on_socket_open(self, client, userdata, sock):
+        self.loop.add_reader(sock, client.loop_read)
+        self.misc = self.loop.create_task(self.misc_loop())
+        
+    def on_socket_close(self, client, userdata, sock):
+        self.loop.remove_reader(sock)
+        if self.misc:
+            self.misc.cancel()
+            
+    def on_socket_register_write(self, client, userdata, sock):
+        self.loop.add_writer(sock, client.loop_write)
+        
+    def on_socket_unregister_write(self, client, userdata, sock):
+        self.loop.remove_writer(sock)
+        
+    async def misc_loop(self):
+        """Keepalive pings and retries, the periodic part of the paho network loop"""
+        while self.client.loop_misc() == mqtt.MQTT_ERR_SUCCESS:
+            try:
+                await asyncio.sleep(1)
+            except asyncio.CancelledError:
+                break
+
+
+class SensorSimulator:
+    def __init__(self, broker_host="localhost", broker_port=1883, username=None, password=None,
+                 seed=None, mqtt_v5=True, farm_id=FARM_ID, payload_schema="ph", include_farm_id=False):
+        if payload_schema not in PAYLOAD_SCHEMAS:
+            raise ValueError(f"Unknown payload_schema {payload_schema!r}, expected one of {PAYLOAD_SCHEMAS}")
+            
+        # MQTT 5 lets repeated topics travel as 2-byte aliases; pass mqtt_v5=False
+        # for brokers that only speak 3.1.1 (full topics are then sent every time)
+        self.client = mqtt.Client(client_id=f"simulator_{random.randint(1000, 9999)}",
+                                  protocol=mqtt.MQTTv5 if mqtt_v5 else mqtt.MQTTv311)
+        if username:
+            self.client.username_pw_set(username=username, password=password)
+        # Back-pressure for QoS 1 (status): at most 20 awaiting PUBACK, 1000 waiting behind them;
+        # beyond that publish() fails fast instead of queueing without bound on a slow broker.
+        # Telemetry uses QoS 0, which paho writes straight out and never queues here.
+        self.client.max_inflight_messages_set(20)
+        self.client.max_queued_messages_set(1000)
+        self.broker_host = broker_host
+        self.broker_port = broker_port
+        self.connected = False
+        self.loop = None
+        self._stop = None
+        self._connected = None
+        self._disconnected = None
+        self._pending = {}  # mid -> future resolved by on_publish
+        self._tmpl = {}  # device_id -> (topic, payload template, value keys)
+        self._status_topics = {}  # device_id -> status topic
+        self.farm_id = farm_id
+        self._ph_key = payload_schema
+        self._farm = {"farmId": farm_id} if include_farm_id else {}  # merged into every payload
+        self._batch_topic = f"sensor/farm/{farm_id}/batch"
+        self._batch_topic_z = self._batch_topic + "/z"
+        self._aliases = {}  # topic -> PUBLISH properties carrying its alias
+        self._alias_max = 0  # TopicAliasMaximum granted by the broker
+        
+        # Simulation state
+        self.rng = np.random.default_rng(seed)
+        self._rand_buf = np.empty(0)
+        self._rand_pos = 0
+        self.base_temperature = 28.0
+        self.base_humidity = 65.0
+        self.base_soil_moisture = 50.0  # starting level of every soil sensor
+        self.base_ph_level = 6.5  # starting level of every pH sensor
+        self.soil_moisture = np.empty(0)  # per-device, sized by _group_devices
+        self.light_intensity = 10000.0
+        self.ph_level = np.empty(0)
+        
+        # Time tracking
+        self.start_time = time.time()
+        self.hour = 0.0  # simulated hour of the current iteration
+        
+        # sin((hour - 6) * pi / 12) for every simulated minute of the day
+        self._sin_lut = [math.sin((m / 60.0 - 6) * math.pi / 12) for m in range(1440)]
+        
+        # Device type -> simulate method; unknown types are skipped
+        self._sim_dispatch = {
+            "DHT22": self.simulate_dht22,
+            "SOIL_MOISTURE": self.simulate_soil_moisture,
+            "LIGHT": self.simulate_light_sensor,
+            "PH": self.simulate_ph_sensor,
+        }
+        
+        # Setup MQTT callbacks
+        self.client.on_connect = self.on_connect
+        self.client.on_disconnect = self.on_disconnect
+        self.client.on_publish = self.on_publish
+        
+    def on_connect(self, client, userdata, flags, rc, properties=None):
+        # Aliases only live as long as the session; the broker says how many it accepts
+        self._aliases = {}
+        self._alias_max = getattr(properties, "TopicAliasMaximum", 0)
+        if rc == 0:
+            print("✅ Connected to MQTT Broker!")
+            self.connected = True
+            # Small MQTT packets should go out immediately, not wait on Nagle's algorithm
+            client.socket().setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        else:
+            print(f"❌ Failed to connect, return code {rc}")
+        if self._connected and not self._connected.done():
+            self._connected.set_result(rc == 0)
+            
+    def on_disconnect(self, client, userdata, rc, properties=None):
+        print("⚠️  Disconnected from MQTT Broker")
+        self.connected = False
+        # Aliases die with the session; none may be used until the next CONNACK grants new ones
+        self._aliases = {}
+        self._alias_max = 0
+        
+        # Nothing in flight will be acknowledged any more
+        for future in self._pending.values():
+            if not future.done():
+                future.set_result(False)
+        self._pending.clear()
+        
+        if self._disconnected and not self._disconnected.done():
+            self._disconnected.set_result(rc)
+            
+    def on_publish(self, client, userdata, mid):
+        future = self._pending.pop(mid, None)
+        if future and not future.done():
+            future.set_result(True)
+            
+    async def connect(self):
+        """Connect to MQTT broker"""
+        self.loop = asyncio.get_running_loop()
+        AsyncioHelper(self.loop, self.client)
+        self._connected = self.loop.create_future()
+        try:
+            self.client.connect(self.broker_host, self.broker_port, 60)
+            return await asyncio.wait_for(self._connected, timeout=10)
+        except asyncio.TimeoutError:
+            print("❌ Connection timed out")
+            return False
+        except Exception as e:
+            print(f"❌ Connection error: {e}")
+            return False
+            
+    async def _reconnect(self) -> bool:
+        """Reconnect and wait for the CONNACK, so nothing is published on a session that isn't up yet"""
+        self._connected = self.loop.create_future()
+        try:
+            self.client.reconnect()
+            return await asyncio.wait_for(self._connected, timeout=10)
+        except asyncio.TimeoutError:
+            print("❌ Reconnect timed out")
+            return False
+        except OSError as e:
+            print(f"❌ Reconnect failed: {e}")
+            return False
+            
+    async def disconnect(self):
+        """Disconnect from MQTT broker"""
+        if not self.connected:
+            return
+        self._disconnected = self.loop.create_future()
+        self.client.disconnect()
+        try:
+            await asyncio.wait_for(self._disconnected, timeout=5)
+        except asyncio.TimeoutError:
+            pass
+            
+    def stop(self):
+        """Ask the running simulation loop to stop"""
+        if self._stop:
+            self._stop.set()
+            
+    def _publish_nowait(self, topic: str, payload, qos: int = 0) -> mqtt.MQTTMessageInfo:
+        """Hand a message to paho and return at once; info.rc says whether it was accepted"""
+        props = None
+        if qos == 0:
+            # Send each telemetry topic in full once, then only its alias.
+            # QoS 1 keeps the full topic so a resend after reconnect never depends on a stale alias.
+            props = self._aliases.get(topic)
+            if props is not None:
+                topic = ""
+            elif len(self._aliases) < self._alias_max:
+                props = Properties(PacketTypes.PUBLISH)
+                props.TopicAlias = len(self._aliases) + 1
+        info = self.client.publish(topic, payload, qos=qos, properties=props)
+        if info.rc == mqtt.MQTT_ERR_SUCCESS and topic and props is not None:
+            self._aliases[topic] = props
+        return info
+        
+    async def _publish(self, topic: str, payload, qos: int = 1) -> bool:
+        """Publish and wait until paho reports the message sent (QoS 0) or acknowledged (QoS 1)"""
+        info = self._publish_nowait(topic, payload, qos)
+        if info.rc != mqtt.MQTT_ERR_SUCCESS:
+            return False
+        if info.is_published():
+            return True
+            
+        future = self.loop.create_future()
+        self._pending[info.mid] = future
+        try:
+            return await asyncio.wait_for(future, ACK_TIMEOUT)
+        except asyncio.TimeoutError:
+            # A stalled broker or half-open socket must not block startup or shutdown
+            self._pending.pop(info.mid, None)
+            return False
+        
+    def get_time_factor(self) -> float:
+        """Get time-based factor for day/night simulation"""
+        elapsed = time.time() - self.start_time
+        # Simulate 24 hours in 24 minutes (1 minute = 1 hour)
+        hour_of_day = (elapsed / 60) % 24
+        return hour_of_day
+        
+    def _uniform(self, low: float, high: float, n: int) -> np.ndarray:
+        """n uniform samples in [low, high), served from a block drawn ahead of time"""
+        if self._rand_pos + n > len(self._rand_buf):
+            self._rand_buf = self.rng.random(max(RANDOM_BUFFER_SIZE, n))
+            self._rand_pos = 0
+        samples = self._rand_buf[self._rand_pos:self._rand_pos + n]
+        self._rand_pos += n
+        return low + (high - low) * samples
+        
+    def _group_devices(self, devices: list) -> Dict[str, List[str]]:
+        """Group device ids by sensor type and size the per-device state"""
+        groups = {}
+        for device in devices:
+            groups.setdefault(device["type"], []).append(device["id"])
+            
+        # Soil moisture and pH drift independently per device, from the base levels on every run
+        self.soil_moisture = np.full(len(groups.get("SOIL_MOISTURE", [])), self.base_soil_moisture)
+        self.ph_level = np.full(len(groups.get("PH", [])), self.base_ph_level)
+        return groups
+        
+    def _dispatch_groups(self, devices: list) -> List[tuple]:
+        """(simulate method, device ids) per known sensor type, resolved once up front"""
+        return [(self._sim_dispatch[device_type], device_ids)
+                for device_type, device_ids in self._group_devices(devices).items()
+                if device_type in self._sim_dispatch]
+        
+    def _simulate_tick(self, groups: List[tuple]):
+        """Readings of every device for the current simulated time, and that time in epoch ms"""
+        self.hour = self.get_time_factor()
+        
+        # One timestamp for every reading of this iteration (ISO for readings, epoch ms for batches)
+        now = datetime.now()
+        ts = now.isoformat()
+        readings = []
+        for simulate, device_ids in groups:
+            # Generate sensor data for all devices of a type at once
+            readings.extend(simulate(device_ids, ts))
+        return readings, int(now.timestamp() * 1000)
+        
+    def simulate_dht22(self, device_ids: List[str], ts: str) -> List[Dict[str, Any]]:
+        """Simulate DHT22 sensors (Temperature + Humidity)"""
+        n = len(device_ids)
+        
+        # Temperature varies with time of day
+        temp_variation = 5 * self._sin_lut[int(self.hour * 60) % 1440]
+        temperature = self.base_temperature + temp_variation + self._uniform(-1, 1, n)
+        
+        # Humidity inversely correlated with temperature
+        humidity = self.base_humidity - (temp_variation * 2) + self._uniform(-3, 3, n)
+        humidity = np.clip(humidity, 30, 95)
+        
+        return [
+            {
+                **self._farm,
+                "deviceId": device_id,
+                "sensorType": "DHT22",
+                "temperature": temp,
+                "humidity": hum,
+                "timestamp": ts
+            }
+            for device_id, temp, hum in zip(device_ids, temperature.round(2).tolist(), humidity.round(2).tolist())
+        ]
+        
+    def simulate_soil_moisture(self, device_ids: List[str], ts: str) -> List[Dict[str, Any]]:
+        """Simulate soil moisture sensors"""
+        n = len(device_ids)
+        
+        # Soil moisture gradually decreases
+        self.soil_moisture -= self._uniform(0.05, 0.15, n)
+        
+        # Simulate irrigation events (random spikes)
+        irrigated = self._uniform(0, 1, n) < 0.02  # 2% chance per reading
+        if irrigated.any():
+            self.soil_moisture[irrigated] += self._uniform(15, 25, int(irrigated.sum()))
+            for i in np.flatnonzero(irrigated):
+                logger.info("💧 Irrigation event on %s! Moisture increased to %.1f%%", device_ids[i], self.soil_moisture[i])
+                
+        # Keep within realistic bounds
+        np.clip(self.soil_moisture, 20, 70, out=self.soil_moisture)
+        
+        return [
+            {
+                **self._farm,
+                "deviceId": device_id,
+                "sensorType": "SOIL_MOISTURE",
+                "soilMoisture": moisture,
+                "timestamp": ts
+            }
+            for device_id, moisture in zip(device_ids, self.soil_moisture.round(2).tolist())
+        ]
+        
+    def simulate_light_sensor(self, device_ids: List[str], ts: str) -> List[Dict[str, Any]]:
+        """Simulate light intensity sensors"""
+        hour = self.hour
+        n = len(device_ids)
+        
+        # Light intensity based on time of day
+        if 6 <= hour <= 18:  # Daytime
+            # Peak at noon (hour 12)
+            light_factor = self._sin_lut[int(hour * 60) % 1440]
+            self.light_intensity = 50000 * light_factor + self._uniform(-2000, 2000, n)
+        else:  # Nighttime
+            self.light_intensity = self._uniform(0, 100, n)
+            
+        self.light_intensity = np.maximum(self.light_intensity, 0)
+        
+        return [
+            {
+                **self._farm,
+                "deviceId": device_id,
+                "sensorType": "LIGHT",
+                "lightIntensity": light,
+                "timestamp": ts
+            }
+            for device_id, light in zip(device_ids, self.light_intensity.round(2).tolist())
+        ]
+        
+    def simulate_ph_sensor(self, device_ids: List[str], ts: str) -> List[Dict[str, Any]]:
+        """Simulate pH sensors"""
+        # pH changes slowly
+        self.ph_level += self._uniform(-0.02, 0.02, len(device_ids))
+        np.clip(self.ph_level, 5.5, 7.5, out=self.ph_level)
+        
+        return [
+            {
+                **self._farm,
+                "deviceId": device_id,
+                "sensorType": "PH",
+                self._ph_key: ph,
+                "timestamp": ts
+            }
+            for device_id, ph in zip(device_ids, self.ph_level.round(2).tolist())
+        ]
+        
+    def _build_template(self, device_id: str, data: Dict[str, Any]):
+        """
+        Turn a device's first reading into a bytes payload template with the same keys.
+        The template is None when a measurement isn't a plain number (str, None, bool, ...).
+        """
+        topic = f"sensor/{device_id}/data"
+        parts = []
+        keys = []
+        for key, value in data.items():
+            if key == "timestamp":
+                continue
+            if key not in ("farmId", "deviceId", "sensorType"):
+                if isinstance(value, bool) or not isinstance(value, (int, float)):
+                    return topic, None, ()
+                parts.append(orjson.dumps(key).decode().replace("%", "%%") + ":%.2f")
+                keys.append(key)
+            else:
+                # Constant fields (deviceId, sensorType, ...) are baked in
+                parts.append(orjson.dumps({key: value})[1:-1].decode().replace("%", "%%"))
+        parts.append('"timestamp":"%s"')
+        
+        template = ("{" + ",".join(parts) + "}").encode()
+        return topic, template, tuple(keys)
+        
+    def publish_sensor_data(self, device_id: str, data: Dict[str, Any]) -> bool:
+        """Publish sensor data to MQTT"""
+        tmpl = self._tmpl.get(device_id)
+        if tmpl is None:
+            tmpl = self._tmpl[device_id] = self._build_template(device_id, data)
+        topic, template, keys = tmpl
+        try:
+            payload = template % (*[data[key] for key in keys], data["timestamp"].encode())
+        except TypeError:
+            # No template, or a later reading the template can't render: encode the whole dict
+            payload = orjson.dumps(data)
+        
+        # Telemetry is resent every interval, so QoS 0 fire-and-forget is enough: no PUBACK
+        # round trip and no waiting for the socket write, hence no coroutine either.
+        # Per-message output goes through logging (silent at the default WARNING level)
+        if self._publish_nowait(topic, payload).rc == mqtt.MQTT_ERR_SUCCESS:
+            logger.info("📤 Published %s data from %s", data.get("sensorType", "UNKNOWN"), device_id)
+            return True
+        logger.warning("❌ Failed to publish data for %s", device_id)
+        return False
+            
+    def publish_batch(self, readings: list, bt: int) -> bool:
+        """Publish all readings of one iteration as a single SenML-style message"""
+        topic = self._batch_topic
+        
+        # One record per device, ordered by name (SenML "n")
+        entries = []
+        for data in sorted(readings, key=lambda r: r["deviceId"]):
+            entry = {"n": data["deviceId"]}
+            entry.update({k: v for k, v in data.items() if k not in ("deviceId", "farmId", "timestamp")})
+            entries.append(entry)
+            
+        payload = orjson.dumps({
+            "bn": self.farm_id,
+            "bt": bt,
+            "e": entries
+        })
+        
+        # Repetitive keys compress well; the /z topic suffix tells the backend to inflate
+        if len(payload) > COMPRESS_THRESHOLD:
+            payload = zlib.compress(payload, 1)
+            topic = self._batch_topic_z
+            
+        # Telemetry: QoS 0 fire-and-forget, same as publish_sensor_data
+        if self._publish_nowait(topic, payload).rc == mqtt.MQTT_ERR_SUCCESS:
+            logger.info("📤 Published batch of %d readings for farm %s", len(entries), self.farm_id)
+            return True
+        logger.warning("❌ Failed to publish batch for farm %s", self.farm_id)
+        return False
+            
+    async def publish_device_status(self, device_id: str, status: str):
+        """Publish device status"""
+        topic = self._status_topics.get(device_id) or f"device/{device_id}/status"
+        payload = orjson.dumps({
+            **self._farm,
+            "deviceId": device_id,
+            "status": status,
+            "timestamp": datetime.now()
+        })
+        
+        # Status transitions are not repeated, so they keep QoS 1 and wait for the PUBACK
+        if await self._publish(topic, payload, qos=1):
+            logger.info("📡 Published status for %s: %s", device_id, status)
+        else:
+            logger.warning("❌ Failed to publish status for %s", device_id)
+        
+    def run_simulation(self, devices: list, interval: int = 10, batch: bool = True):
+        """Run continuous simulation"""
+        if sys.platform == "win32":
+            # add_reader/add_writer need a selector loop; the default Proactor loop lacks them
+            asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+        previous = signal.getsignal(signal.SIGINT)
+        try:
+            asyncio.run(self._run(devices, interval, batch))
+        finally:
+            # _run's Ctrl+C handler must not outlive its event loop
+            signal.signal(signal.SIGINT, previous)
+        
+    async def _run(self, devices: list, interval: int, batch: bool):
+        print("\n" + "="*60)
+        print("🌾 Smart Farm IoT Simulator Started")
+        print("="*60)
+        print(f"Devices: {len(devices)}")
+        print(f"Interval: {interval} seconds")
+        print(f"Broker: {self.broker_host}:{self.broker_port}")
+        print(f"Mode: {'batch' if batch else 'per-device'}")
+        print("="*60 + "\n")
+        
+        if not await self.connect():
+            print("❌ Failed to connect to MQTT broker. Exiting...")
+            return
+            
+        # Topics are built once and reused on every publish
+        self._status_topics = {device["id"]: f"device/{device['id']}/status" for device in devices}
+        
+        # Send initial status for all devices
+        await asyncio.gather(*(self.publish_device_status(device["id"], "ONLINE") for device in devices))
+        
+        # The first Ctrl+C only wakes the deadline wait below, shutdown happens after the loop;
+        # it also puts the previous handler back, so a second Ctrl+C interrupts as usual
+        self._stop = asyncio.Event()
+        previous = signal.getsignal(signal.SIGINT)
+        
+        def on_sigint(signum, frame):
+            signal.signal(signal.SIGINT, previous)
+            self.loop.call_soon_threadsafe(self.stop)
+            
+        signal.signal(signal.SIGINT, on_sigint)
+        
+        groups = self._dispatch_groups(devices)
+        
+        iteration = 0
+        next_tick = self.loop.time()
+        while not self._stop.is_set():
+            iteration += 1
+            online = self.connected or await self._reconnect()
+            readings, bt = self._simulate_tick(groups)
+            
+            # Publish to MQTT; without a session this tick's readings are dropped
+            if not online:
+                sent = 0
+            elif batch:
+                sent = len(readings) if self.publish_batch(readings, bt) else 0
+            else:
+                sent = sum(self.publish_sensor_data(data["deviceId"], data) for data in readings)
+                
+            # Fixed-rate schedule on the loop's monotonic clock: deadlines advance by interval,
+            # so work time doesn't accumulate drift
+            next_tick += interval
+            now = self.loop.time()
+            if next_tick < now:
+                next_tick = now
+            
+            # One summary line per iteration instead of one line per message
+            print(f"--- Iteration {iteration} | 🕐 {int(self.hour):02d}:00 | "
+                  f"📤 {sent}/{len(readings)} readings | 💤 {next_tick - now:.1f}s ---")
+            try:
+                await asyncio.wait_for(self._stop.wait(), next_tick - now)
+            except asyncio.TimeoutError:
+                pass
+                
+        print("\n\n🛑 Stopping simulator...")
+        
+        # Send offline status for all devices
+        await asyncio.gather(*(self.publish_device_status(device["id"], "OFFLINE") for device in devices))
+        
+        await self.disconnect()
+        print("✅ Simulator stopped gracefully")
+        
+    def run_benchmark(self, devices: list, messages: int, batch: bool = True):
+        """Publish messages as fast as possible, then report the throughput"""
+        if sys.platform == "win32":
+            asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+        asyncio.run(self._benchmark(devices, messages, batch))
+        
+    async def _benchmark(self, devices: list, messages: int, batch: bool):
+        print(f"⏱️  Benchmark: {messages} messages, {len(devices)} devices, "
+              f"{'batch' if batch else 'per-device'} mode, broker {self.broker_host}:{self.broker_port}")
+        
+        if not await self.connect():
+            print("❌ Failed to connect to MQTT broker. Exiting...")
+            return
+            
+        groups = self._dispatch_groups(devices)
+        count = 0
+        sent = 0
+        start = time.perf_counter_ns()
+        # A dropped connection ends the run; it is not retried mid-measurement
+        while count < messages and self.connected:
+            readings, bt = self._simulate_tick(groups)
+            if batch:
+                count += 1
+                sent += self.publish_batch(readings, bt)
+            else:
+                readings = readings[:messages - count]
+                count += len(readings)
+                sent += sum(self.publish_sensor_data(data["deviceId"], data) for data in readings)
+            # No sleep between iterations, but yield so the socket writer can drain
+            await asyncio.sleep(0)
+            
+        # Count a message only once it has been written to the socket
+        while self.connected and self.client.want_write():
+            await asyncio.sleep(0)
+        elapsed_ns = time.perf_counter_ns() - start
+        
+        if not self.connected:
+            print("⚠️  Connection lost, benchmark stopped early")
+        print(f"📊 {sent}/{count} messages in {elapsed_ns / 1e6:.1f} ms -> {sent * 1e9 / elapsed_ns:,.0f} msg/s")
+        await self.disconnect()
@@ -0,0 +1,75 @@
+"""
+Per-process pool of connected MQTT clients, one per broker and user,
+so scripts that connect repeatedly reuse a session instead of opening a new one
+"""
+
+import socket
+import threading
+import paho.mqtt.client as mqtt
+
+_clients = {}  # (host, port, user) -> connected mqtt.Client
+_hooks = {}  # (host, port, user) -> callbacks run with the client after every successful connect
+
+
+def _on_connect(client, userdata, flags, rc):
+    connack, hooks = userdata
+    if rc == 0:
+        # Small MQTT packets should go out immediately, not wait on Nagle's algorithm
+        client.socket().setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        # e.g. subscriptions, which have to be renewed on every new session
+        for hook in hooks:
+            hook(client)
+    # Wake get_client() as soon as the CONNACK arrives, accepted or not
+    connack.set()
+
+
+def get_client(host="localhost", port=1883, user=None, pw=None, timeout=5.0, on_connect=None):
+    """
+    Return a connected client for the broker, or None if it cannot connect in time.
+    on_connect(client) runs for the current session and again after every reconnect.
+    """
+    key = (host, port, user)
+    hooks = _hooks.setdefault(key, [])
+    new_hook = on_connect is not None and on_connect not in hooks
+    if new_hook:
+        hooks.append(on_connect)
+        
+    client = _clients.get(key)
+    if client is not None and client.is_connected():
+        if new_hook:
+            # The session is already up, so the hook missed its connect
+            on_connect(client)
+        return client
+    if client is not None:
+        # Dropped session: stop its network thread before replacing it
+        client.loop_stop()
+
+    connack = threading.Event()
+    client = mqtt.Client(userdata=(connack, hooks))
+    if user:
+        client.username_pw_set(username=user, password=pw)
+    client.on_connect = _on_connect
+    try:
+        client.connect(host, port, 60)
+    except OSError as e:
+        print(f"Connection error to {host}:{port}: {e}")
+        return None
+    # The network thread keeps the shared session alive (keepalive, reconnect) between users
+    client.loop_start()
+
+    connack.wait(timeout)
+    if not client.is_connected():
+        client.loop_stop()
+        return None
+
+    _clients[key] = client
+    return client
+
+
+def close_all():
+    """Disconnect every pooled client"""
+    for client in _clients.values():
+        client.disconnect()
+        client.loop_stop()
+    _clients.clear()
+    _hooks.clear()
@@ -62,11 +62,15 @@ public class MqttConfig {
                 clientId + "_inbound",
                 mqttClientFactory(),
                 "sensor/+/data", // Subscribe to all sensor data
+                "sensor/farm/+/batch", // Subscribe to batched (SenML-style) sensor data
+                "sensor/farm/+/batch/z", // Same, zlib-compressed
                 "device/+/status" // Subscribe to device status
         );
 
         adapter.setCompletionTimeout(5000);
-        adapter.setConverter(new DefaultPahoMessageConverter());
+        DefaultPahoMessageConverter converter = new DefaultPahoMessageConverter();
+        converter.setPayloadAsBytes(true); // Keep raw bytes so compressed batches can be inflated
+        adapter.setConverter(converter);
         adapter.setQos(1);
         adapter.setOutputChannel(mqttInputChannel());
 
@@ -18,9 +18,14 @@ import org.springframework.stereotype.Service;
 import org.springframework.transaction.annotation.Transactional;
 import com.example.iotserver.enums.DeviceStatus;
 
+import java.io.ByteArrayInputStream;
+import java.io.IOException;
+import java.nio.charset.StandardCharsets;
 import java.time.LocalDateTime;
 import java.time.temporal.ChronoUnit;
+import java.util.List;
 import java.util.Map;
+import java.util.zip.InflaterInputStream;
 
 @Service
 @Slf4j
@@ -46,11 +51,16 @@ public class MqttMessageHandler {
         try {
             MessageHeaders headers = message.getHeaders();
             String topic = (String) headers.get("mqtt_receivedTopic");
-            String payload = message.getPayload().toString();
+            byte[] rawPayload = (byte[]) message.getPayload();
+            String payload = topic.endsWith("/batch/z")
+                    ? inflate(rawPayload)
+                    : new String(rawPayload, StandardCharsets.UTF_8);
 
             log.info("Received MQTT message - Topic: {}, Payload: {}", topic, payload);
 
-            if (topic.startsWith("sensor/")) {
+            if (topic.startsWith("sensor/farm/") && (topic.endsWith("/batch") || topic.endsWith("/batch/z"))) {
+                handleSensorBatch(payload);
+            } else if (topic.startsWith("sensor/")) {
                 handleSensorData(topic, payload);
             } else if (topic.startsWith("device/")) {
                 handleDeviceStatus(topic, payload);
@@ -61,11 +71,51 @@ public class MqttMessageHandler {
         }
     }
 
+    /**
+     * Giải nén payload zlib của các batch gửi lên topic .../batch/z.
+     */
+    private String inflate(byte[] compressed) throws IOException {
+        try (InflaterInputStream in = new InflaterInputStream(new ByteArrayInputStream(compressed))) {
+            return new String(in.readAllBytes(), StandardCharsets.UTF_8);
+        }
+    }
+
     @Transactional
     private void handleSensorData(String topic, String payload) {
         try {
             String deviceId = topic.split("/")[1];
             Map<String, Object> data = objectMapper.readValue(payload, Map.class);
+            processSensorData(deviceId, data);
+        } catch (Exception e) {
+            log.error("Error processing sensor data: {}", e.getMessage(), e);
+        }
+    }
+
+    /**
+     * Tách message gộp kiểu SenML ({"bn", "bt", "e": [{"n": deviceId, ...}]})
+     * thành từng bản ghi và xử lý như dữ liệu của từng thiết bị.
+     */
+    private void handleSensorBatch(String payload) {
+        try {
+            Map<String, Object> batch = objectMapper.readValue(payload, Map.class);
+            Object entries = batch.get("e");
+            if (!(entries instanceof List<?> records)) {
+                log.warn("Batch sensor message has no records: {}", payload);
+                return;
+            }
+
+            for (Object record : records) {
+                if (record instanceof Map<?, ?> entry && entry.get("n") != null) {
+                    processSensorData(entry.get("n").toString(), (Map<String, Object>) entry);
+                }
+            }
+        } catch (Exception e) {
+            log.error("Error processing sensor batch: {}", e.getMessage(), e);
+        }
+    }
+
+    private void processSensorData(String deviceId, Map<String, Object> data) {
+        try {
             SensorDataDTO sensorData = SensorDataDTO.fromMqttPayload(deviceId, data);
 
             // SỬA LỖI Ở ĐÂY: Tìm Device và Farm ID TRƯỚC KHI LƯU